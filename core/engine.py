@@ -11,12 +11,15 @@ Example:
     >>> engine.start()
 """
 
+import atexit
 import importlib
+import os
+import selectors
 import sys
 import traceback
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterable, Optional, Tuple
 from types import ModuleType
 
 # --- BOOTSTRAP: Root path injection ---
@@ -25,6 +28,7 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from utils.colors import paint, RED, GREEN, YELLOW, BLUE
+from utils.logger import log, log_to_fd, flush
 from tracker.dependency import DependencyTracker
 from tracker.watcher import FileWatcher
 from hot_reload.reloader import ModuleReloader
@@ -44,7 +48,12 @@ class Engine:
         entry_name: The stem name of the entry point file.
         user_module: The currently loaded user module, or None if not loaded.
         log_file: Path to the error log file.
-        DEBOUNCE_SECONDS: Time to wait after a file change before reloading.
+        DEBOUNCE_SECONDS: Quiet period required after a burst of changes
+                          before reloading.
+        MAX_BATCH_SECONDS: Upper bound on how long a burst of changes is
+                           batched before a reload is forced.
+        SETTLE_SECONDS: How long a lone change must stay unchanged before
+                        it is reloaded on the leading edge.
     
     Example:
         >>> engine = Engine("app.py")
@@ -63,48 +72,88 @@ class Engine:
         self.watcher: FileWatcher = FileWatcher(self.tracker)
         self.entry_name: str = self.tracker.entry_point.stem
         self.user_module: Optional[ModuleType] = None
+        self._user_run: Optional[Callable[[], object]] = None
         self.log_file: str = "engine_error.log"
+        # Opened on the first error, so error-free runs don't create the file
+        self._log_fd: Optional[int] = None
+        atexit.register(self._close_log)
         self.DEBOUNCE_SECONDS: float = 0.5
+        self.MAX_BATCH_SECONDS: float = 0.5
+        self.SETTLE_SECONDS: float = 0.1
+        self._last_reload_time: float = 0.0
+        self._settle_stats: Optional[Dict[Path, Optional[Tuple[int, int]]]] = None
+        self._batch_start: Optional[float] = None
+        self._sys_path_injected: bool = False
 
     def _log_error(self, error_traceback: str) -> None:
         """
-        Write an error traceback to the log file and alert the user.
+        Append an error traceback to the log file and alert the user.
         
         Args:
             error_traceback: The formatted traceback string to log.
         """
-        with open(self.log_file, "w", encoding="utf-8") as f:
-            f.write(error_traceback)
-        print(paint(f"\n[!] EXECUTION/RECONSTRUCTION FAILED", RED))
-        print(paint(f"Detailed traceback saved to: {self.log_file}", YELLOW))
+        if self._log_fd is None:
+            # Kept open in append mode so every error is kept, and logging
+            # one is a single write() rather than open/write/close
+            self._log_fd = os.open(
+                self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+            )
+        
+        # Written by the background logger so a slow disk can't stall a reload
+        header = f"--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---\n"
+        log_to_fd(self._log_fd, header + error_traceback)
+        log(f"\n[!] EXECUTION/RECONSTRUCTION FAILED", RED)
+        log(f"Detailed traceback saved to: {self.log_file}", YELLOW)
+
+    def _close_log(self) -> None:
+        """
+        Flush pending log writes and close the error log file descriptor.
+        """
+        if self._log_fd is None:
+            return
+        flush(timeout=1.0)
+        os.close(self._log_fd)
 
     def _safe_import(self) -> bool:
         """
         Attempt to import or reload the user's module.
         
-        This method handles both initial imports and subsequent reloads,
-        catching any exceptions to keep the engine alive.
+        This method handles both initial imports and subsequent reloads
+        (by importing a fresh module object), catching any exceptions to
+        keep the engine alive.
         
         Returns:
             True if the import was successful, False otherwise.
         """
+        # sys.modules is about to change, so the reloader's view is stale
+        self.reloader.invalidate_loaded_paths()
         try:
-            script_dir = str(self.tracker.base_dir)
-            if script_dir not in sys.path:
-                sys.path.insert(0, script_dir)
+            if not self._sys_path_injected:
+                script_dir = str(self.tracker.base_dir)
+                if script_dir not in sys.path:
+                    sys.path.insert(0, script_dir)
+                self._sys_path_injected = True
             
-            # Reconstruction Logic: Force reload if already in sys.modules
-            if self.entry_name in sys.modules:
-                self.user_module = importlib.reload(sys.modules[self.entry_name])
-            else:
-                self.user_module = importlib.import_module(self.entry_name)
-                
-            print(paint(f"[*] {self.entry_name} reconstructed successfully.", GREEN))
+            # Finder caches only go stale when files appear; skip the
+            # directory re-stat on the common modify-only reload
+            if self.watcher.had_create_event:
+                self.watcher.had_create_event = False
+                importlib.invalidate_caches()
+            
+            # Reconstruction Logic: Always import into a fresh module object,
+            # so globals from the previous version can't survive the reload
+            sys.modules.pop(self.entry_name, None)
+            self.user_module = importlib.import_module(self.entry_name)
+            # The module object is replaced on every reload, so look run() up once
+            self._user_run = getattr(self.user_module, "run", None)
+            
+            log(f"[*] {self.entry_name} reconstructed successfully.", GREEN)
             return True
         except Exception:
             # Catch SyntaxError and others to keep the engine alive
             self._log_error(traceback.format_exc())
             self.user_module = None
+            self._user_run = None
             return False
 
     def start(self) -> None:
@@ -112,8 +161,9 @@ class Engine:
         Start the engine in non-blocking auto-reload mode.
         
         This method enters an infinite loop that:
-        1. Monitors for file changes via the FileWatcher
-        2. Debounces rapid saves to avoid partial reloads
+        1. Waits for file change notifications from the FileWatcher
+        2. Reloads a lone change immediately, and debounces bursts of
+           rapid saves to avoid partial reloads
         3. Evicts affected modules from sys.modules
         4. Re-imports and executes the user's code
         
@@ -125,38 +175,140 @@ class Engine:
         self.watcher.start()
         print(paint(f"\n--- Kern Engine Ignited (AUTO-MODE) ---", BLUE))
         print(paint(f"Monitoring: {self.entry_name}. Press Ctrl+C to stop.", BLUE))
+        print(paint(
+            f"Scanned {len(self.watcher.dependencies)} file(s): "
+            f"{self.tracker.cache_hits} from cache, "
+            f"{self.tracker.cache_misses} parsed.",
+            BLUE
+        ))
         
         # Initial run attempt
         self._safe_import()
         self._execute_user_code()
 
+        # Block in the OS (epoll/kqueue) on the watcher's wakeup fd where
+        # possible, falling back to waiting on its change event
+        selector: Optional[selectors.BaseSelector] = None
+        if self.watcher.wakeup_fd is not None:
+            selector = selectors.DefaultSelector()
+            selector.register(self.watcher.wakeup_fd, selectors.EVENT_READ)
+
+        timeout = self.DEBOUNCE_SECONDS
         try:
             while True:
-                # 1. Passive Change Detection
+                # 1. Block until the watcher signals a change (or the debounce
+                #    window elapses), instead of waking on a fixed heartbeat
+                if selector is not None:
+                    if selector.select(timeout=timeout):
+                        self.watcher.drain_wakeups()
+                else:
+                    self.watcher.change_event.wait(timeout=timeout)
+                self.watcher.change_event.clear()
+                timeout = self.DEBOUNCE_SECONDS
+
+                # 2. Passive Change Detection
                 if self.watcher.change_detected:
+                    now = time.time()
+                    if self._batch_start is None:
+                        self._batch_start = now
                     
-                    # 2. Debounce Check: Has enough time passed since the last save?
-                    time_since_last_save = time.time() - self.watcher.last_change_time
+                    # 3. Debounce Check: A lone change after an idle period is
+                    #    reloaded as soon as the file settles (leading edge).
+                    #    Anything else is batched until the saves go quiet,
+                    #    capped so a file that keeps changing still reloads
+                    #    regularly.
+                    time_since_last_save = now - self.watcher.last_change_time
+                    time_in_batch = now - self._batch_start
+                    leading = (
+                        now - self._last_reload_time > self.DEBOUNCE_SECONDS
+                        and len(self.watcher.changed_files) == 1
+                    )
+                    settled = False
+                    if leading:
+                        # The first event of a save is often the truncate or
+                        # a partial write, so the file must keep its size and
+                        # mtime for SETTLE_SECONDS (polling can miss writes)
+                        stats = self._stat_files(self.watcher.changed_files)
+                        settled = (
+                            time_since_last_save >= self.SETTLE_SECONDS
+                            and stats == self._settle_stats
+                        )
+                        self._settle_stats = stats
                     
-                    if time_since_last_save >= self.DEBOUNCE_SECONDS:
-                        # Grab the changed files
-                        dirty = self.watcher.get_and_clear_dirty()
-                        
-                        # Surgery removes poisoned modules from sys.modules
-                        self.reloader.reload_affected_modules(dirty)
-                        
-                        # Always try to re-import when a stable change is detected
-                        print(paint(f"\n[v] Stable change detected. Attempting recovery...", YELLOW))
-                        if self._safe_import():
-                            self._execute_user_code()
-                
-                # 3. Heartbeat Sleep (Prevents high CPU usage)
-                time.sleep(0.1)
+                    if (
+                        settled
+                        or time_since_last_save >= self.DEBOUNCE_SECONDS
+                        or time_in_batch >= self.MAX_BATCH_SECONDS
+                    ):
+                        self._reload()
+                    elif leading:
+                        # Check again once the file had time to settle
+                        timeout = self.SETTLE_SECONDS
+                        if time_since_last_save < self.SETTLE_SECONDS:
+                            timeout -= time_since_last_save
+                    else:
+                        # Wake up exactly when the trailing edge is due
+                        timeout = min(
+                            self.DEBOUNCE_SECONDS - time_since_last_save,
+                            self.MAX_BATCH_SECONDS - time_in_batch
+                        )
                 
         except KeyboardInterrupt:
+            self.tracker.close()
+            flush()
             print(paint("\n[!] Engine stopped by user. Goodbye!", BLUE))
             sys.exit(0)
 
+    @staticmethod
+    def _stat_files(paths: Iterable[Path]) -> Dict[Path, Optional[Tuple[int, int]]]:
+        """
+        Get the size and modification time of each file.
+        
+        Args:
+            paths: The files to stat.
+            
+        Returns:
+            Dictionary mapping each file to (st_size, st_mtime_ns), or to
+            None if it can't be stat'ed.
+        """
+        stats: Dict[Path, Optional[Tuple[int, int]]] = {}
+        for path in list(paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                stats[path] = None
+                continue
+            stats[path] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def _reload(self) -> None:
+        """
+        Evict the modules affected by pending changes and re-run the user's code.
+        
+        Events recorded before the last reload re-imported the code (e.g.
+        the second write of a save landing during the eviction) were
+        already picked up by it, so they are dropped without reloading.
+        Event times are compared rather than file stats, which can't tell
+        apart two saves within the filesystem's mtime granularity.
+        """
+        self._batch_start = None
+        self._settle_stats = None
+
+        # Grab the changed files
+        dirty = self.watcher.get_and_clear_dirty()
+        if not dirty or self.watcher.last_change_time < self._last_reload_time:
+            return
+        
+        # Surgery removes poisoned modules from sys.modules
+        self.reloader.reload_affected_modules(dirty)
+        # Writes recorded from here on may not be seen by the import below
+        self._last_reload_time = time.time()
+        
+        # Always try to re-import when a stable change is detected
+        log(f"\n[v] Stable change detected. Attempting recovery...", YELLOW)
+        if self._safe_import():
+            self._execute_user_code()
+
     def _execute_user_code(self) -> None:
         """
         Execute the user's run() function if it exists.
@@ -164,11 +316,13 @@ class Engine:
         This method safely calls the run() function from the user's module,
         catching any exceptions to prevent crashes.
         """
+        # Hand over the console only once Kern's queued messages are out
+        flush()
         if self.user_module:
             try:
-                if hasattr(self.user_module, "run"):
+                if self._user_run is not None:
                     print(paint(f"--- Executing {self.entry_name}.run() ---", BLUE))
-                    self.user_module.run()
+                    self._user_run()
                     print(paint("-" * 30, BLUE))
                 else:
                     print(paint(f"\n[?] Warning: No 'run()' function found in {self.entry_name}.py", YELLOW))
@@ -6,11 +6,29 @@ layer of Kern's architecture. It identifies and evicts affected modules
 from Python's module cache to force clean re-imports.
 """
 
+import os
 import sys
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Set, List, Optional
+from typing import Dict, FrozenSet, Iterable, Set, List, Optional
 
-from utils.colors import paint, YELLOW
+from utils.colors import YELLOW
+from utils.logger import log
+
+
+@lru_cache(maxsize=1024)
+def _resolve_file(file: str) -> Path:
+    """
+    Resolve a module's __file__ to an absolute path, memoized per string.
+    
+    Args:
+        file: The module's __file__ attribute.
+        
+    Returns:
+        The resolved path.
+    """
+    return Path(file).resolve()
 
 
 class ModuleReloader:
@@ -24,6 +42,13 @@ class ModuleReloader:
     Attributes:
         tracker: The DependencyTracker instance used to resolve dependencies.
         base_dir: The base directory of the project being monitored.
+        entry_name: The module name of the entry point file.
+        _reverse_graph: Mapping of each file to the set of files importing it.
+        _deps_cache: Cached direct imports of each file in the reverse graph.
+        _project_files_cache: All project files, updated from dirty files.
+        _loaded_paths: Cached files of project modules currently in sys.modules.
+        _path_to_module: Module name of every project file, rebuilt only when
+                         the set of project files changes.
     """
     
     def __init__(self, tracker) -> None:
@@ -35,26 +60,185 @@ class ModuleReloader:
         """
         self.tracker = tracker
         self.base_dir: Path = self.tracker.base_dir
+        self._base_str: str = str(self.base_dir) + os.sep
+        self._entry_resolved: Path = self.tracker.entry_point.resolve()
+        self.entry_name: str = self.tracker.entry_point.stem
+        self._reverse_graph: Dict[Path, Set[Path]] = {}
+        self._deps_cache: Dict[Path, FrozenSet[Path]] = {}
+        self._project_files_cache: Optional[Set[Path]] = None
+        self._py_files: Optional[Dict[str, str]] = None
+        self._stale_files: Set[Path] = set()
+        self._loaded_paths: Optional[Set[Path]] = None
+        self._path_to_module: Dict[Path, str] = {}
+        self._mapped_files: Set[Path] = set()
 
-    def _get_module_name(self, file_path: Path) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _get_module_name(base_str: str, file_path: Path) -> Optional[str]:
         """
         Convert a file path to its corresponding Python module name.
         
+        Uses plain string slicing against the base directory rather than
+        Path arithmetic. Results are memoized per (base_str, file_path)
+        pair since the same paths are revisited on every reload.
+        
         Args:
+            base_str: The project root, including a trailing separator.
             file_path: Absolute path to a Python file.
             
         Returns:
             The dotted module name (e.g., "package.module"), or None if
-            the path cannot be converted.
+            the path is not inside the project root.
+        """
+        path_str = str(file_path)
+        if not path_str.startswith(base_str):
+            return None
+        rel = path_str[len(base_str):]
+        if rel.endswith(".py"):
+            rel = rel[:-3]
+        parts = rel.split(os.sep)
+        if parts[-1] == "__init__":
+            parts.pop()
+        return ".".join(parts)
+
+    def _refresh_module_names(self, all_files: Set[Path]) -> None:
+        """
+        Rebuild the path -> module name mapping if the project files changed.
+        
+        Args:
+            all_files: Set of all Python files in the project.
+        """
+        if all_files == self._mapped_files:
+            return
+        self._path_to_module = {
+            p: name for p in all_files
+            if (name := self._get_module_name(self._base_str, p))
+        }
+        self._mapped_files = set(all_files)
+
+    def _get_loaded_paths(self) -> Set[Path]:
+        """
+        Get the resolved files of all project modules in sys.modules.
+        
+        Only modules that are currently imported can need eviction, so the
+        dependent traversal is restricted to these files. The result is
+        cached until invalidate_loaded_paths() is called.
+        
+        Returns:
+            Set of resolved file paths of loaded modules under base_dir.
+        """
+        if self._loaded_paths is None:
+            loaded: Set[Path] = set()
+            for module in list(sys.modules.values()):
+                file = getattr(module, "__file__", None)
+                if file and file.startswith(self._base_str):
+                    loaded.add(_resolve_file(file))
+            self._loaded_paths = loaded
+        return self._loaded_paths
+
+    def invalidate_loaded_paths(self) -> None:
+        """
+        Forget the cached set of loaded module files.
+        
+        Call this whenever modules are (re-)imported, e.g. after the engine
+        reconstructs the user's module.
+        """
+        self._loaded_paths = None
+
+    def _get_project_files(self, dirty_paths: Set[Path]) -> Set[Path]:
+        """
+        Get all project files, updating the cached set incrementally.
+        
+        The tracker's import graph is brought up to date first, which only
+        re-parses changed files. Then only the dirty files (and files
+        marked stale by the entry point fast path) are relinked in the
+        reverse graph; everything else keeps its cached dependencies. The
+        reverse graph is rebuilt from scratch only when Python files were
+        added to or removed from the project tree; the tracker only walks
+        the tree again after the watcher reported such a change.
+        
+        Args:
+            dirty_paths: Set of resolved file paths that have changed.
+            
+        Returns:
+            Set of all Python files in the project.
+        """
+        py_files = self.tracker.get_project_index()
+        dependencies = self.tracker.get_local_dependencies()
+        if self._project_files_cache is None or py_files is not self._py_files:
+            # Files were added or removed: start over from a full scan
+            self._py_files = py_files
+            self._project_files_cache = dependencies
+            self._deps_cache.clear()
+            self._reverse_graph.clear()
+            self._stale_files.clear()
+            return self._project_files_cache
+
+        changed = (dirty_paths | self._stale_files) & self._project_files_cache
+        self._stale_files.clear()
+        for file_path in changed:
+            self._unlink_graph_entry(file_path)
+            self._link_graph_entry(file_path)
+        # Pick up files reachable through newly added imports
+        self._project_files_cache |= dependencies
+        return self._project_files_cache
+
+    def _build_reverse_graph(self, all_files: Set[Path]) -> None:
+        """
+        Build (or refresh) the reverse dependency graph of the project.
+        
+        Each file is scanned once and its dependencies are inverted into a
+        mapping of file -> files that import it. Entries stay cached until
+        the file shows up as dirty, so only changed files are re-parsed.
+        
+        Args:
+            all_files: Set of all Python files in the project.
+        """
+        # Drop files that are no longer part of the project
+        for stale_file in set(self._deps_cache) - all_files:
+            self._unlink_graph_entry(stale_file)
+
+        for file_path in all_files - self._deps_cache.keys():
+            self._link_graph_entry(file_path)
+
+    def _link_graph_entry(self, file_path: Path) -> FrozenSet[Path]:
+        """
+        Add the edges a file contributes to the reverse graph.
+        
+        Only direct imports are linked, so editing one file's imports only
+        changes that file's edges; the traversal in
+        _get_all_dependents_iterative follows them transitively.
+        
+        Args:
+            file_path: The file whose imports should be cached.
+            
+        Returns:
+            The file's direct imports, or an empty set if it can't be scanned.
         """
         try:
-            rel_path = file_path.relative_to(self.base_dir)
-            parts = list(rel_path.with_suffix("").parts)
-            if parts and parts[-1] == "__init__":
-                parts.pop()
-            return ".".join(parts)
+            deps = self.tracker.get_imports(file_path)
         except Exception:
-            return None
+            return frozenset()
+        deps.discard(file_path)
+
+        self._deps_cache[file_path] = frozenset(deps)
+        for dep in deps:
+            self._reverse_graph.setdefault(dep, set()).add(file_path)
+        return self._deps_cache[file_path]
+
+    def _unlink_graph_entry(self, file_path: Path) -> None:
+        """
+        Remove the edges contributed by a file from the reverse graph.
+        
+        Args:
+            file_path: The file whose cached dependencies should be dropped.
+        """
+        for dep in self._deps_cache.pop(file_path, frozenset()):
+            dependents = self._reverse_graph.get(dep)
+            if dependents is not None:
+                dependents.discard(file_path)
+                if not dependents:
+                    del self._reverse_graph[dep]
 
     def _get_all_dependents_iterative(
         self,
@@ -64,7 +248,7 @@ class ModuleReloader:
         """
         Find all files that depend on the dirty files (iteratively).
         
-        Uses a stack-based approach to traverse the dependency graph and
+        Uses a breadth-first traversal of the reverse dependency graph to
         identify all modules that need to be evicted.
         
         Args:
@@ -75,26 +259,20 @@ class ModuleReloader:
             Set of all file paths that need to be evicted, including the
             initial dirty files and all their dependents.
         """
+        self._build_reverse_graph(all_project_files)
+
         to_evict = set(initial_dirty_files)
-        stack = list(initial_dirty_files)
-
-        while stack:
-            current_file = stack.pop()
-            for candidate_file in all_project_files:
-                if candidate_file in to_evict:
-                    continue
-                
-                # Check parents using the tracker logic
-                tracker_temp = self.tracker.__class__(candidate_file)
-                try:
-                    if current_file in tracker_temp.get_local_dependencies():
-                        to_evict.add(candidate_file)
-                        stack.append(candidate_file)
-                except Exception:
-                    continue
+        queue = deque(initial_dirty_files)
+
+        while queue:
+            current_file = queue.popleft()
+            for dependent in self._reverse_graph.get(current_file, ()):
+                if dependent not in to_evict:
+                    to_evict.add(dependent)
+                    queue.append(dependent)
         return to_evict
 
-    def reload_affected_modules(self, dirty_paths: List[Path]) -> List[str]:
+    def reload_affected_modules(self, dirty_paths: Iterable[Path]) -> List[str]:
         """
         Evict all modules affected by the given dirty file paths.
         
@@ -103,20 +281,38 @@ class ModuleReloader:
         order (children before parents).
         
         Args:
-            dirty_paths: List of file paths that have been modified.
+            dirty_paths: File paths that have been modified. Duplicates are
+                        coalesced before the dependency traversal.
             
         Returns:
             List of module names that were evicted from sys.modules.
         """
+        # Watcher paths are already canonical, normalizing is enough here
+        dirty_paths = {Path(os.path.normpath(p)) for p in dirty_paths}
         if not dirty_paths:
             return []
 
-        all_project_files = self.tracker.get_local_dependencies()
+        # Fast path: editing the entry point itself only evicts the entry
+        # point, unless something in the project imports it back
+        if (
+            dirty_paths == {self._entry_resolved}
+            and not self._reverse_graph.get(self._entry_resolved)
+        ):
+            # Its imports may have changed; re-scan it on the next full reload
+            self._stale_files.add(self._entry_resolved)
+            if sys.modules.pop(self.entry_name, None) is None:
+                return []
+            log(f"[Reloader] Evicting: {self.entry_name}", YELLOW)
+            return [self.entry_name]
+
+        all_project_files = self._get_project_files(dirty_paths)
+        self._refresh_module_names(all_project_files)
+
+        # Files that were never imported can't hold stale modules
         to_evict_paths = self._get_all_dependents_iterative(
-            set(dirty_paths),
-            all_project_files
+            dirty_paths,
+            all_project_files & self._get_loaded_paths()
         )
-        evicted_names: List[str] = []
 
         # Sort by depth to ensure children are evicted before parents
         sorted_eviction = sorted(
@@ -125,18 +321,29 @@ class ModuleReloader:
             reverse=True
         )
 
-        for path in sorted_eviction:
-            module_name = self._get_module_name(path)
-            if module_name and module_name in sys.modules:
-                print(paint(f"[Reloader] Evicting: {module_name}", YELLOW))
-                del sys.modules[module_name]
-                evicted_names.append(module_name)
-            
-            # Catch the __main__ entry point stem
-            if path.resolve() == self.tracker.entry_point.resolve():
-                entry_name = self.tracker.entry_point.stem
-                if entry_name in sys.modules:
-                    del sys.modules[entry_name]
-                    evicted_names.append(entry_name)
-
-        return list(set(evicted_names))
\ No newline at end of file
+        # Phase 1: Collect every loaded module that has to go
+        evicted_names: List[str] = [
+            name for path in sorted_eviction
+            if (
+                name := self._path_to_module.get(path)
+                or self._get_module_name(self._base_str, path)
+            )
+            and name in sys.modules
+        ]
+
+        # Catch the __main__ entry point stem
+        if self._entry_resolved in to_evict_paths:
+            if self.entry_name in sys.modules:
+                evicted_names.append(self.entry_name)
+
+        # Drop duplicates while keeping the child-before-parent eviction order
+        evicted_names = list(dict.fromkeys(evicted_names))
+
+        # Phase 2: Evict in one tight pass so sys.modules is only briefly
+        # inconsistent, and log afterwards
+        for name in evicted_names:
+            sys.modules.pop(name, None)
+        for name in evicted_names:
+            log(f"[Reloader] Evicting: {name}", YELLOW)
+
+        return evicted_names
\ No newline at end of file
@@ -5,6 +5,9 @@ setup(
     version="0.1.0",
     description="A deep-reloading development engine for Python",
     author="Emmanuel Obolo Oluwapelumi & Abiodun Kumuyi",
+    extras_require={
+        "watch": ["watchdog>=2.0"],
+    },
     packages=find_packages(include=["core", "core.*", "tracker", "tracker.*", "hot_reload", "hot_reload.*", "utils", "utils.*"]),
     entry_points={
         "console_scripts": [
@@ -4,29 +4,50 @@ Kern File Watcher - Background thread for monitoring file changes.
 This module provides the FileWatcher class which runs as a daemon thread,
 continuously monitoring project files for modifications. When a change is
 detected, it signals the main engine loop to trigger a reload.
+
+If the optional `watchdog` package is installed, changes are delivered by
+the operating system (inotify, FSEvents, ReadDirectoryChangesW). Otherwise
+the watcher falls back to polling file modification times.
 """
 
 import os
 import threading
 import time
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Set, List
+from typing import Dict, FrozenSet, Set, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import PatternMatchingEventHandler
+except ImportError:  # watchdog is optional, fall back to polling
+    Observer = None
+    PatternMatchingEventHandler = None
 
 
 class FileWatcher(threading.Thread):
     """
     Background thread that monitors files for changes.
     
-    This class polls file modification times to detect changes. It runs as
-    a daemon thread so it automatically terminates when the main program exits.
+    This class listens for OS file system events when `watchdog` is
+    available, and polls file modification times otherwise. It runs as a
+    daemon thread so it automatically terminates when the main program exits.
     
     Attributes:
         tracker: The DependencyTracker instance for getting files to monitor.
         dependencies: Set of file paths currently being monitored.
-        last_mtimes: Dictionary mapping file paths to their last modification times.
+        last_mtimes: Dictionary mapping file paths to their last st_mtime_ns.
         changed_files: Set of files that have changed since last check.
         change_detected: Flag indicating if any changes have been detected.
         last_change_time: Timestamp of the most recent change detection.
+        change_event: Event set whenever a change is detected, so waiters
+                      can block instead of polling change_detected.
+        had_create_event: Flag indicating that Python files were created or
+                          renamed since the consumer last reset it.
+        wakeup_fd: Readable end of a pipe that receives a byte per change,
+                   for use with selectors, or None where unsupported.
+        RESCAN_DELAY_SECONDS: Quiet period after the last change before the
+                              background worker re-scans dependencies.
     """
     
     def __init__(self, tracker) -> None:
@@ -40,65 +61,302 @@ class FileWatcher(threading.Thread):
         super().__init__(daemon=True)
         self.tracker = tracker
         self.dependencies: Set[Path] = self.tracker.get_local_dependencies()
-        self.last_mtimes: Dict[Path, float] = self._get_mtimes()
+        self._dirs_for: Optional[Set[Path]] = None
+        self._dirs: Dict[str, Dict[str, Path]] = {}
+        self.last_mtimes: Dict[Path, int] = self._get_mtimes()
         self.changed_files: Set[Path] = set()
         self.change_detected: bool = False
         self.last_change_time: float = 0.0
+        self.change_event: threading.Event = threading.Event()
+        self.had_create_event: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        self._observer: Optional[Observer] = None
+        self.RESCAN_DELAY_SECONDS: float = 0.1
+        self._rescan_requested: threading.Event = threading.Event()
+        self._rescan_paths: Set[Path] = set()
+        self._import_fingerprints: Dict[Path, bytes] = {}
+        self._layout_changed: bool = False
+        self._rescan_worker: threading.Thread = threading.Thread(
+            target=self._rescan_loop, name="kern-rescan", daemon=True
+        )
+
+        # Self-pipe so waiters can block on a selectable fd (POSIX only;
+        # select() on Windows only works with sockets)
+        self.wakeup_fd: Optional[int] = None
+        self._wakeup_write_fd: Optional[int] = None
+        if os.name == "posix":
+            self.wakeup_fd, self._wakeup_write_fd = os.pipe()
+            os.set_blocking(self.wakeup_fd, False)
+            os.set_blocking(self._wakeup_write_fd, False)
+
+    def _group_by_dir(self) -> Dict[str, Dict[str, Path]]:
+        """
+        Group the monitored files by their parent directory.
+        
+        The grouping is cached until the dependency set is replaced.
+        
+        Returns:
+            Dictionary mapping each directory to its monitored files, keyed
+            by file name.
+        """
+        dependencies = self.dependencies
+        if dependencies is not self._dirs_for:
+            dirs: Dict[str, Dict[str, Path]] = defaultdict(dict)
+            for p in dependencies:
+                dirs[str(p.parent)][p.name] = p
+            self._dirs = dirs
+            self._dirs_for = dependencies
+        return self._dirs
 
-    def _get_mtimes(self) -> Dict[Path, float]:
+    def _get_mtimes(self) -> Dict[Path, int]:
         """
         Get the current modification times of all monitored files.
         
+        Reads each directory once with os.scandir instead of calling
+        os.stat per file.
+        
         Returns:
-            Dictionary mapping file paths to their modification timestamps.
+            Dictionary mapping file paths to their st_mtime_ns.
         """
-        mtimes: Dict[Path, float] = {}
-        for p in self.dependencies:
+        mtimes: Dict[Path, int] = {}
+        for dir_path, files in self._group_by_dir().items():
             try:
-                mtimes[p] = os.stat(p).st_mtime
-            except FileNotFoundError:
+                entries = os.scandir(dir_path)
+            except OSError:
                 continue
+            with entries:
+                for entry in entries:
+                    p = files.get(entry.name)
+                    if p is None:
+                        continue
+                    try:
+                        mtimes[p] = entry.stat(follow_symlinks=False).st_mtime_ns
+                    except FileNotFoundError:
+                        continue
         return mtimes
 
-    def get_and_clear_dirty(self) -> List[Path]:
+    def get_and_clear_dirty(self) -> FrozenSet[Path]:
         """
-        Get the list of changed files and reset the change detection state.
+        Get the set of changed files and reset the change detection state.
         
         This method is typically called by the main engine loop after it
-        has detected that changes occurred.
+        has detected that changes occurred. Repeated events for the same
+        file (editors often write several times per save) are coalesced.
         
         Returns:
-            List of file paths that have been modified since the last call.
+            Set of file paths that have been modified since the last call.
         """
-        dirty = list(self.changed_files)
-        self.changed_files.clear()
-        self.change_detected = False
+        with self._lock:
+            dirty = frozenset(self.changed_files)
+            self.changed_files.clear()
+            self.change_detected = False
         return dirty
 
+    def _record_change(self, path: Path) -> None:
+        """
+        Mark a monitored file as changed and wake up any waiters.
+        
+        The dependency re-scan is left to the background worker, so the
+        event is delivered to the engine without waiting on a parse.
+        
+        Args:
+            path: The file that was modified.
+        """
+        # Drop the stale tree now; the worker re-parses it later
+        self.tracker.invalidate(path)
+        
+        with self._lock:
+            self.changed_files.add(path)
+            self._rescan_paths.add(path)
+            
+            # Signal detection and update the timestamp
+            self.change_detected = True
+            self.last_change_time = time.time()
+        self.change_event.set()
+        if self._wakeup_write_fd is not None:
+            try:
+                os.write(self._wakeup_write_fd, b"\0")
+            except BlockingIOError:
+                pass  # Pipe is full, a wakeup is already pending
+        self._rescan_requested.set()
+
+    def _rescan_loop(self) -> None:
+        """
+        Re-scan dependencies after changes, once each burst has settled.
+        
+        Runs forever on the rescan worker thread. Editors often write a
+        file several times per save, so the scan waits until no change has
+        arrived for RESCAN_DELAY_SECONDS and then runs once for the burst,
+        and only if one of the changed files edited its imports or files
+        were created, moved or deleted (imports may now resolve elsewhere).
+        """
+        while True:
+            self._rescan_requested.wait()
+            self._rescan_requested.clear()
+            while self._rescan_requested.wait(self.RESCAN_DELAY_SECONDS):
+                self._rescan_requested.clear()
+            
+            with self._lock:
+                paths = self._rescan_paths
+                self._rescan_paths = set()
+                layout_changed = self._layout_changed
+                self._layout_changed = False
+            if not self._imports_changed(paths) and not layout_changed:
+                continue
+            
+            # Re-scan since the user edited an import or the layout changed.
+            # Only changed files are re-parsed, everything else is served
+            # from the tracker's cache.
+            try:
+                dependencies = self.tracker.get_local_dependencies()
+            except Exception:
+                continue
+            with self._lock:
+                if dependencies - self.dependencies:
+                    # Newly imported files: import finder caches may be stale
+                    self.had_create_event = True
+                self.dependencies = dependencies
+
+    def _imports_changed(self, paths: Set[Path]) -> bool:
+        """
+        Check whether any of the given files changed its import statements.
+        
+        Compares each file's import fingerprint with the one recorded the
+        last time it was checked. A file seen for the first time counts as
+        changed; one that doesn't parse doesn't, since scanning it wouldn't
+        find its imports either.
+        
+        Args:
+            paths: The files that changed since the last re-scan.
+        
+        Returns:
+            True if a full dependency re-scan is needed.
+        """
+        changed = False
+        for path in paths:
+            fingerprint = self.tracker.import_fingerprint(path)
+            if fingerprint is None:
+                continue
+            if self._import_fingerprints.get(path) != fingerprint:
+                self._import_fingerprints[path] = fingerprint
+                changed = True
+        return changed
+
+    def drain_wakeups(self) -> None:
+        """
+        Consume pending notifications written to wakeup_fd.
+        
+        Call this after a selector reports wakeup_fd as readable, so the
+        next select() blocks until a new change arrives.
+        """
+        if self.wakeup_fd is None:
+            return
+        try:
+            while os.read(self.wakeup_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _invalidate_layout(self) -> None:
+        """
+        Mark the project layout as changed and schedule a re-scan.
+        
+        A file that appears or disappears can change what existing imports
+        resolve to without any import statement being edited.
+        """
+        self.tracker.invalidate_layout()
+        with self._lock:
+            self._layout_changed = True
+        self._rescan_requested.set()
+
+    def _on_fs_event(self, event) -> None:
+        """
+        Handle a file system event delivered by the watchdog observer.
+        
+        Args:
+            event: The watchdog event. For moves (atomic saves), the
+                  destination path is the file that changed.
+        """
+        path = Path(getattr(event, "dest_path", "") or event.src_path)
+        if path in self.dependencies:
+            self._record_change(path)
+
+    def _on_fs_created(self, event) -> None:
+        """
+        Handle a file creation (or rename) delivered by the watchdog observer.
+        
+        Args:
+            event: The watchdog event.
+        """
+        self.had_create_event = True
+        self._invalidate_layout()
+        self._on_fs_event(event)
+
+    def _on_fs_deleted(self, event) -> None:
+        """
+        Handle a file deletion delivered by the watchdog observer.
+        
+        Args:
+            event: The watchdog event.
+        """
+        self._invalidate_layout()
+
+    def _start_observer(self) -> bool:
+        """
+        Start an OS-native file system observer on the project directory.
+        
+        Returns:
+            True if the observer is running, False if watchdog is not
+            installed or the platform has no usable backend (e.g., WSL1).
+        """
+        if Observer is None:
+            return False
+        
+        handler = PatternMatchingEventHandler(
+            patterns=["*.py"], ignore_directories=True
+        )
+        handler.on_modified = self._on_fs_event
+        handler.on_created = self._on_fs_created
+        handler.on_moved = self._on_fs_created
+        handler.on_deleted = self._on_fs_deleted
+        
+        observer = Observer()
+        try:
+            observer.schedule(handler, str(self.tracker.base_dir), recursive=True)
+            observer.start()
+        except Exception:
+            return False
+        self._observer = observer
+        return True
+
     def run(self) -> None:
         """
         Main loop that continuously monitors files for changes.
         
-        This method runs in a separate thread and polls file modification
-        times every 0.3 seconds. When a change is detected, it:
+        When an OS-native observer is available, this thread simply keeps
+        it alive. Otherwise it polls file modification times every 0.3
+        seconds. When a change is detected, it:
         1. Updates the last known modification time
         2. Adds the file to the changed_files set
-        3. Re-scans dependencies (in case new imports were added)
-        4. Sets the change_detected flag
+        3. Schedules a dependency re-scan (in case new imports were added)
+        4. Sets the change_detected flag, change_event and wakeup_fd
         5. Records the change timestamp for debouncing
+        
+        Dependency re-scans run on a separate worker thread.
         """
+        self._rescan_worker.start()
+        if self._start_observer():
+            self._observer.join()
+            return
+        
         while True:
             current_mtimes = self._get_mtimes()
             for path, mtime in current_mtimes.items():
                 if mtime > self.last_mtimes.get(path, 0):
                     self.last_mtimes[path] = mtime
-                    self.changed_files.add(path)
-                    
-                    # Re-scan in case the user added a new import
-                    self.dependencies = self.tracker.get_local_dependencies()
-                    
-                    # Signal detection and update the timestamp
-                    self.change_detected = True
-                    self.last_change_time = time.time()
+                    # Polling can't see files being created, so the
+                    # project layout is re-checked on every change
+                    self._invalidate_layout()
+                    self._record_change(path)
             
-            time.sleep(0.3)
\ No newline at end of file
+            time.sleep(0.3)
@@ -5,8 +5,13 @@ This package contains utility modules used throughout Kern:
 
 Modules:
     colors: Terminal color codes and styling functions.
+    logger: Background writer for console and log file output.
 """
 
 from utils.colors import paint, RED, GREEN, YELLOW, BLUE, RESET  # noqa: F401
+from utils.logger import log, log_to_fd, flush  # noqa: F401
 
-__all__ = ["paint", "RED", "GREEN", "YELLOW", "BLUE", "RESET"]
+__all__ = [
+    "paint", "RED", "GREEN", "YELLOW", "BLUE", "RESET",
+    "log", "log_to_fd", "flush",
+]
@@ -0,0 +1,107 @@
+"""
+Kern Logger - Background writer for console and log file output.
+
+This module moves Kern's own output off the reload critical path. Messages
+are pushed onto a queue and written by a daemon thread, so callers return
+as soon as the record is queued instead of waiting on a slow console or
+disk.
+
+Example:
+    >>> from utils.logger import log, flush
+    >>> from utils.colors import GREEN
+    >>> log("Success!", GREEN)
+    >>> flush()  # Wait until everything queued so far has been written
+"""
+
+import atexit
+import os
+import queue
+import sys
+import threading
+from typing import Optional
+
+from utils.colors import paint
+
+_logq: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+_writer: Optional[threading.Thread] = None
+_writer_lock: threading.Lock = threading.Lock()
+
+
+def _drain() -> None:
+    """
+    Consume queued records forever, writing each one in order.
+    """
+    while True:
+        kind, *payload = _logq.get()
+        try:
+            if kind == "console":
+                color, text = payload
+                sys.stdout.write(paint(text, color) + "\n")
+                sys.stdout.flush()
+            elif kind == "fd":
+                fd, data = payload
+                os.write(fd, data)
+            elif kind == "flush":
+                payload[0].set()
+        except Exception:
+            continue  # Never let a failed write kill the writer thread
+
+
+def _put(record: tuple) -> None:
+    """
+    Queue a record, starting the writer thread on first use.
+    
+    Args:
+        record: A tuple whose first item is the record kind.
+    """
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(
+                    target=_drain, name="kern-logger", daemon=True
+                )
+                _writer.start()
+    _logq.put_nowait(record)
+
+
+def log(text: str, color: str) -> None:
+    """
+    Queue a colorized line for the console.
+    
+    Args:
+        text: The text to print.
+        color: An ANSI color code (e.g., RED, GREEN, YELLOW, BLUE).
+    """
+    _put(("console", color, text))
+
+
+def log_to_fd(fd: int, text: str) -> None:
+    """
+    Queue text to be written (UTF-8 encoded) to an open file descriptor.
+    
+    Args:
+        fd: A file descriptor opened for writing, e.g. with O_APPEND.
+        text: The text to write.
+    """
+    _put(("fd", fd, text.encode("utf-8")))
+
+
+def flush(timeout: Optional[float] = None) -> None:
+    """
+    Block until every record queued so far has been written.
+    
+    Call this before handing the console to user code, so Kern's messages
+    are not interleaved with the user's output.
+    
+    Args:
+        timeout: Maximum number of seconds to wait, or None to wait forever.
+    """
+    if _writer is None:
+        return
+    done = threading.Event()
+    _logq.put_nowait(("flush", done))
+    done.wait(timeout)
+
+
+atexit.register(flush, 1.0)